@@ -0,0 +1,296 @@
+# Tkinter window for the post-install GUI; loaded by app.py in GUI mode only,
+# so the headless --check path works without Tk installed.
+import os
+import sys
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+import queue
+import re
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+from app import BASH, SCRIPT
+
+# Cap on log lines kept in the Text widget (older lines are dropped)
+MAX_LOG_LINES = 5000
+# Trim only once this many extra lines have piled up, so deletes are batched
+LOG_TRIM_SLACK = 500
+# Lines handled per poll (checked per queued chunk); the rest waits for the next tick
+POLL_BATCH = 500
+# Log flush interval (ms): short while output is flowing, long when idle
+POLL_BUSY_MS = 20
+POLL_IDLE_MS = 200
+# Pipe read size for the script's output
+READ_CHUNK = 64 * 1024
+# Opt-in: refresh pacman databases in the background while options are picked
+PREWARM_DB = os.environ.get('AUTOINSTALL_PREWARM') == '1'
+
+# Subtle dark palette
+BG = '#111418'
+BG_ALT = '#1a1f24'
+BG_ACTIVE = '#232a31'
+BG_LOG = '#0f1317'
+FG = '#D6D7D9'
+FG_BUTTON = '#E6E7E8'
+FG_OK = '#7bd88f'
+FG_WARN = '#ffcc66'
+FG_ERR = '#ff6e6e'
+
+# Stage marker printed by the script's profile runs: "[step N/M]"
+STEP_RE = re.compile(r'\[step (\d+)/(\d+)\]')
+
+
+def line_tag(line):
+    # Log line -> tag, in priority order (err > ok > warn). Plain substring
+    # tests with a single lowercase copy; benchmarked faster than a regex
+    if 'FAIL' in line:
+        return 'err'
+    low = line.lower()
+    if 'error' in low:
+        return 'err'
+    if 'OK' in line or 'done' in low:
+        return 'ok'
+    if 'warn' in low:
+        return 'warn'
+    return None
+
+
+class App(tk.Tk):
+    def __init__(self):
+        super().__init__()
+        self.title('Autoinstall Post-Install (Arch)')
+        self.geometry('900x600')
+        # Build while unmapped so geometry is resolved once, on deiconify
+        self.withdraw()
+        self._setup_theme()
+        self._build_ui()
+        self.deiconify()
+        self.proc = None
+        self.worker = None
+        self.prewarm = None
+        self.q = queue.SimpleQueue()
+        # Two slots: the optional DB prewarm and the script run
+        self.pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='autoinstall')
+        self.protocol('WM_DELETE_WINDOW', self._on_close)
+        if PREWARM_DB:
+            self._prewarm_db()
+
+    def _prewarm_db(self):
+        # Best effort: needs cached sudo credentials; the script syncs again anyway
+        def worker():
+            try:
+                subprocess.run(['sudo', '-n', 'pacman', '-Sy'],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            except Exception:
+                pass
+        self.prewarm = self.pool.submit(worker)
+
+    def _on_close(self):
+        # A running script is left to finish rather than killed mid-transaction
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        self.destroy()
+
+    def _setup_theme(self):
+        style = ttk.Style(self)
+        try:
+            style.theme_use('clam')
+        except Exception:
+            pass
+        self.configure(bg=BG)
+        # Frames, labels, check/radio buttons inherit the root ('.') colours;
+        # only styles that differ from it are configured
+        styles = {
+            '.': dict(background=BG, foreground=FG),
+            'TButton': dict(background=BG_ALT, foreground=FG_BUTTON),
+            'TNotebook.Tab': dict(background=BG_ALT, foreground=FG),
+        }
+        for name, opts in styles.items():
+            style.configure(name, **opts)
+        style.map('TButton', background=[('active', BG_ACTIVE)])
+
+    def _build_ui(self):
+        container = ttk.Frame(self)
+        container.pack(fill='both', expand=True, padx=12, pady=12)
+
+        # Top controls
+        top = ttk.Frame(container)
+        top.pack(fill='x', pady=(0, 8))
+
+        self.profile = tk.StringVar(value='minimal')
+        ttk.Label(top, text='Profile:').pack(side='left')
+        for val, txt in [('minimal', 'Minimal'), ('gaming', 'Gaming'), ('kde', 'KDE')]:
+            ttk.Radiobutton(top, text=txt, value=val, variable=self.profile).pack(side='left', padx=6)
+
+        ttk.Separator(container).pack(fill='x', pady=6)
+
+        # Extras
+        ex = ttk.Frame(container)
+        ex.pack(fill='x')
+        ttk.Label(ex, text='Extras:').grid(row=0, column=0, sticky='w')
+        self.var_gaming = tk.BooleanVar(value=False)
+        self.var_chromium = tk.BooleanVar(value=False)
+        self.var_chrome = tk.BooleanVar(value=False)
+        self.var_spotify = tk.BooleanVar(value=False)
+        ttk.Checkbutton(ex, text='Gaming extras (Lutris, Heroic, Bottles, Prism, ProtonUp)', variable=self.var_gaming).grid(row=1, column=0, sticky='w')
+        ttk.Checkbutton(ex, text='Chromium (repo)', variable=self.var_chromium).grid(row=2, column=0, sticky='w')
+        ttk.Checkbutton(ex, text='Google Chrome (AUR/Flatpak)', variable=self.var_chrome).grid(row=3, column=0, sticky='w')
+        ttk.Checkbutton(ex, text='Spotify (AUR/Flatpak)', variable=self.var_spotify).grid(row=4, column=0, sticky='w')
+
+        # Buttons
+        btns = ttk.Frame(container)
+        btns.pack(fill='x', pady=8)
+        ttk.Button(btns, text='Preflight', command=self.run_check).pack(side='left')
+        self.btn_install = ttk.Button(btns, text='Install', command=self.run_install)
+        self.btn_install.pack(side='left', padx=8)
+        self.progress = ttk.Progressbar(btns, mode='indeterminate')
+        self.progress.pack(side='right', fill='x', expand=True)
+
+        # Log area
+        logf = ttk.Frame(container)
+        logf.pack(fill='both', expand=True)
+        self.txt = tk.Text(logf, bg=BG_LOG, fg=FG, insertbackground=FG)
+        self.txt.pack(fill='both', expand=True)
+        self.txt.tag_config('ok', foreground=FG_OK)
+        self.txt.tag_config('warn', foreground=FG_WARN)
+        self.txt.tag_config('err', foreground=FG_ERR)
+
+        self.after(POLL_IDLE_MS, self._poll_queue)
+
+    def append(self, s, tag=None):
+        self.txt.insert('end', s + '\n', tag)
+        self._trim_log()
+        self.txt.see('end')
+
+    def _trim_log(self):
+        # Keep the widget bounded so inserts stay cheap on long installs
+        lines = int(self.txt.index('end-1c').split('.')[0])
+        if lines > MAX_LOG_LINES + LOG_TRIM_SLACK:
+            self.txt.delete('1.0', f'{lines - MAX_LOG_LINES + 1}.0')
+
+    def _can_run(self):
+        # Fail fast off Linux instead of letting bash/pacman fail later
+        if not sys.platform.startswith('linux'):
+            messagebox.showerror('Error', 'This tool requires Arch Linux.')
+            return False
+        if not os.path.exists(SCRIPT):
+            messagebox.showerror('Error', f'Script not found: {SCRIPT}')
+            return False
+        return True
+
+    def run_check(self):
+        if not self._can_run():
+            return
+        self._run_async([BASH, SCRIPT, "--check"], title='Preflight…')
+
+    def run_install(self):
+        if not self._can_run():
+            return
+        profile = self.profile.get()
+        args = [BASH, SCRIPT, "--yes", "--profile", profile]
+        if self.var_gaming.get():
+            args.append("--gaming-extras")
+        # Ensure gaming extras are installed when profile is "gaming"
+        if profile == 'gaming' and "--gaming-extras" not in args:
+            args.append("--gaming-extras")
+        if self.var_chromium.get():
+            args.append("--install-chromium")
+        if self.var_chrome.get():
+            args.append("--install-chrome")
+        if self.var_spotify.get():
+            args.append("--install-spotify")
+        self._run_async(args, title='Installing…')
+
+    def _run_async(self, args, title='Exécution…'):
+        if self.worker is not None:
+            messagebox.showwarning('Running', 'An execution is already in progress.')
+            return
+        self.append('=' * 60)
+        self.append(title)
+        # Slow pulse until the script reports steps (profiles only)
+        self.progress.configure(mode='indeterminate', value=0)
+        self.progress.start(100)
+        self.btn_install.state(['disabled'])
+        def worker():
+            try:
+                # Wait for the background sync so the script does not hit the DB lock
+                if self.prewarm is not None:
+                    self.prewarm.result()
+                self.proc = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, bufsize=READ_CHUNK)
+                # Read whatever is available and split lines locally; a line ending
+                # in '\r' is held back in case its '\n' arrives with the next chunk.
+                # Each chunk's lines go into the queue as one list.
+                tail = b''
+                while True:
+                    chunk = self.proc.stdout.read1(READ_CHUNK)
+                    if not chunk:
+                        break
+                    lines = (tail + chunk).splitlines(keepends=True)
+                    tail = b'' if lines[-1].endswith(b'\n') else lines.pop()
+                    if lines:
+                        self.q.put([raw.rstrip(b'\r\n').decode('utf-8', 'replace') for raw in lines])
+                if tail:
+                    self.q.put([tail.rstrip(b'\r\n').decode('utf-8', 'replace')])
+                rc = self.proc.wait()
+                self.q.put([f"[exit {rc}]"])
+                return rc
+            except Exception as e:
+                self.q.put([f"[error] {e}"])
+                return None
+        self.worker = self.pool.submit(worker)
+
+    def _append_runs(self, runs):
+        # A single Text.insert with (chars, tags) pairs per run of same-tag
+        # lines; () rather than None for untagged runs keeps the pairs aligned
+        args = []
+        for tag, lines in runs:
+            args += ('\n'.join(lines) + '\n', tag or ())
+        self.txt.insert('end', *args)
+        self._trim_log()
+        self.txt.see('end')
+
+    def _set_step(self, n, total):
+        # Switch to a determinate bar on the first marker; redraw only on change.
+        # Step n has just started, so n - 1 steps are complete.
+        if str(self.progress['mode']) != 'determinate':
+            self.progress.stop()
+            self.progress.configure(mode='determinate', maximum=total)
+        if self.progress['value'] != n - 1:
+            self.progress.configure(value=n - 1)
+
+    def _poll_queue(self):
+        runs = []
+        count = 0
+        step = None
+        # Sampled before draining: once the worker is done, all of its output
+        # is already queued, so an empty queue below means the run is over
+        finished = self.worker is not None and self.worker.done()
+        drained = False
+        try:
+            while count < POLL_BATCH:
+                lines = self.q.get_nowait()
+                count += len(lines)
+                for line in lines:
+                    if line.startswith('[step '):
+                        step = STEP_RE.match(line) or step
+                    tag = line_tag(line)
+                    if runs and runs[-1][0] == tag:
+                        runs[-1][1].append(line)
+                    else:
+                        runs.append((tag, [line]))
+        except queue.Empty:
+            drained = True
+        finally:
+            if runs:
+                self._append_runs(runs)
+            if step is not None:
+                self._set_step(int(step.group(1)), int(step.group(2)))
+            # Reset the controls once per run, after its last line is shown
+            if finished and drained:
+                rc = self.worker.result()
+                self.worker = None
+                self.progress.stop()
+                # A failed run keeps the bar at its last reported step
+                if rc == 0 and str(self.progress['mode']) == 'determinate':
+                    self.progress.configure(value=self.progress['maximum'])
+                self.btn_install.state(['!disabled'])
+        self.after(POLL_BUSY_MS if count else POLL_IDLE_MS, self._poll_queue)
@@ -57,6 +57,11 @@ msg() { echo -e "\e[1;32m[+]\e[0m $*"; }
 warn() { echo -e "\e[1;33m[!]\e[0m $*"; }
 err()  { echo -e "\e[1;31m[x]\e[0m $*" >&2; }
 
+# Progress marker for the GUI: set STEP_TOTAL, then call step before each stage
+STEP=0
+STEP_TOTAL=0
+step() { STEP=$((STEP + 1)); echo "[step $STEP/$STEP_TOTAL]"; }
+
 run() {
   echo "# $*"
   if (( DRY_RUN == 0 )); then "$@"; fi
@@ -74,30 +79,39 @@ ask_yn() {
 
 need_cmd() { command -v "$1" >/dev/null 2>&1 || { err "Missing required command: $1"; return 1; }; }
 
+# AUR helper (paru/yay), resolved once per run. Call directly, not via $(...),
+# so the cached value survives.
+AUR_HELPER=""
+AUR_HELPER_RESOLVED=0
+# Build AUR packages on all cores unless MAKEFLAGS is already set (makepkg.conf still wins)
+AUR_MAKEFLAGS=${MAKEFLAGS:--j$(nproc 2>/dev/null || echo 1)}
+
 detect_aur_helper() {
-  (( SKIP_AUR == 1 )) && { echo ""; return 0; }
-  if command -v paru >/dev/null 2>&1; then echo paru; return 0; fi
-  if command -v yay  >/dev/null 2>&1; then echo yay; return 0; fi
-  echo ""
+  (( AUR_HELPER_RESOLVED == 1 )) && return 0
+  AUR_HELPER=""
+  if (( SKIP_AUR == 0 )); then
+    if command -v paru >/dev/null 2>&1; then AUR_HELPER=paru
+    elif command -v yay >/dev/null 2>&1; then AUR_HELPER=yay
+    fi
+  fi
+  AUR_HELPER_RESOLVED=1
 }
 
 ensure_aur_helper() {
   (( SKIP_AUR == 1 )) && return 1
-  local helper
-  helper=$(detect_aur_helper)
-  if [[ -n "$helper" ]]; then
-    echo "$helper"
-    return 0
-  fi
+  detect_aur_helper
+  [[ -n "$AUR_HELPER" ]] && return 0
   if ask_yn "Install an AUR helper (paru)?" Y; then
     msg "Installing paru (AUR)…"
-    run sudo pacman -S --needed --noconfirm base-devel git
+    install_from_repo base-devel git
     local tmp
     tmp=$(mktemp -d)
-    ( set -e; cd "$tmp"; run git clone https://aur.archlinux.org/paru-bin.git; cd paru-bin; run makepkg -si --noconfirm )
+    run git clone --depth=1 https://aur.archlinux.org/paru-bin.git "$tmp/paru-bin" \
+      && run env -C "$tmp/paru-bin" makepkg -si --noconfirm
     rm -rf "$tmp"
+    AUR_HELPER_RESOLVED=0
     detect_aur_helper
-    return 0
+    [[ -n "$AUR_HELPER" ]] && return 0
   fi
   return 1
 }
@@ -126,28 +140,30 @@ flatpak_install_ids() {
   run flatpak install -y --noninteractive -- "${ids[@]}"
 }
 
-install_app_priority() {
-  # Usage: install_app_priority <label> <repo_pkg|-> <aur_pkg|-> <flatpak_id|->
-  local label="$1"; local repo_pkg="$2"; local aur_pkg="$3"; local flat_id="$4"
-  msg "Installing: $label (priority repo > AUR > Flatpak)"
-  if [[ -n "$repo_pkg" ]] && pacman_pkg_available "$repo_pkg"; then
-    install_from_repo "$repo_pkg"
-    return $?
-  fi
-  if [[ -n "$aur_pkg" ]]; then
-    local helper
-    helper=$(ensure_aur_helper && detect_aur_helper || echo "")
-    if [[ -n "$helper" ]]; then
-      install_from_aur "$helper" "$aur_pkg"
-      return $?
+install_apps_priority() {
+  # Usage: install_apps_priority "<label>|<repo_pkg>|<aur_pkg>|<flatpak_id>"...
+  # Picks a source per app (repo > AUR > Flatpak), then installs each source
+  # in a single call instead of one transaction per app.
+  local -a repo=() aur=() flat=()
+  local spec label repo_pkg aur_pkg flat_id
+  for spec in "$@"; do
+    IFS='|' read -r label repo_pkg aur_pkg flat_id <<<"$spec"
+    if [[ -n "$repo_pkg" ]] && pacman_pkg_available "$repo_pkg"; then
+      msg "$label: repo ($repo_pkg)"
+      repo+=("$repo_pkg")
+    elif [[ -n "$aur_pkg" ]] && ensure_aur_helper; then
+      msg "$label: AUR ($aur_pkg)"
+      aur+=("$aur_pkg")
+    elif [[ -n "$flat_id" ]]; then
+      msg "$label: Flatpak ($flat_id)"
+      flat+=("$flat_id")
+    else
+      warn "Aucune source disponible pour $label."
     fi
-  fi
-  if [[ -n "$flat_id" ]]; then
-    flatpak_install_ids "$flat_id"
-    return $?
-  fi
-  warn "Aucune source disponible pour $label."
-  return 1
+  done
+  install_from_repo "${repo[@]}"
+  install_from_aur "$AUR_HELPER" "${aur[@]}"
+  flatpak_install_ids "${flat[@]}"
 }
 
 # -------- Preflight checks --------
@@ -176,12 +192,26 @@ ensure_sudo() {
 
 check_network() {
   msg "Checking network…"
-  if command -v ping >/dev/null 2>&1; then
-    ping -c1 -W2 1.1.1.1 >/dev/null 2>&1 || { err "No network connectivity (ICMP)."; return 1; }
-  fi
+  # HTTPS probe runs in the background while the TCP connect is tested
+  local https_pid=""
   if command -v curl >/dev/null 2>&1; then
-    curl -fsSLI https://archlinux.org >/dev/null 2>&1 || warn "DNS/HTTPS to archlinux.org failed (continuing)."
+    curl -fsSLI --max-time 10 https://archlinux.org >/dev/null 2>&1 &
+    https_pid=$!
   fi
+  # Plain TCP connect to a public resolver: no ICMP (often filtered), no DNS
+  local tcp_ok=1 https_ok=0
+  timeout 2 bash -c ': >/dev/tcp/1.1.1.1/53' 2>/dev/null || tcp_ok=0
+  if [[ -n "$https_pid" ]] && wait "$https_pid"; then https_ok=1; fi
+  # Either probe succeeding counts as connectivity (port 53 is often blocked)
+  if (( ! tcp_ok && ! https_ok )); then
+    err "No network connectivity (neither TCP 1.1.1.1:53 nor HTTPS archlinux.org reachable)."
+    return 1
+  fi
+  (( tcp_ok )) || warn "TCP 1.1.1.1:53 unreachable, HTTPS OK (continuing)."
+  if [[ -n "$https_pid" ]] && (( ! https_ok )); then
+    warn "DNS/HTTPS to archlinux.org failed (continuing)."
+  fi
+  return 0
 }
 
 ensure_pacman_db() {
@@ -215,54 +245,115 @@ preflight_report() {
   if check_network; then echo "  Network: OK"; else echo "  Network: FAIL"; ok=0; fi
   if command -v pacman >/dev/null 2>&1; then echo "  Pacman: OK"; else echo "  Pacman: MISSING"; ok=0; fi
   if command -v flatpak >/dev/null 2>&1; then echo "  Flatpak: Present"; else echo "  Flatpak: Not installed"; fi
-  detect_aur_helper >/dev/null && echo "  AUR helper: $(detect_aur_helper || echo none)" || echo "  AUR helper: none"
-  return $ok
+  detect_aur_helper
+  echo "  AUR helper: ${AUR_HELPER:-none}"
+  # Exit status: 0 when every required check passed
+  (( ok ))
+}
+
+# -------- Hardware probe --------
+# lspci runs in the background while pacman syncs its databases; the result
+# is read once into GPU_INFO and shared by the summary and driver install.
+GPU_INFO=""
+GPU_INFO_LOADED=0
+GPU_PROBE_FILE=""
+GPU_PROBE_PID=""
+
+start_gpu_probe() {
+  [[ -n "$GPU_PROBE_PID" ]] && return 0
+  GPU_PROBE_FILE=$(mktemp)
+  trap 'rm -f -- "$GPU_PROBE_FILE"' EXIT
+  ( lspci 2>/dev/null | grep -E 'VGA|3D' >"$GPU_PROBE_FILE" || true ) &
+  GPU_PROBE_PID=$!
+}
+
+load_gpu_info() {
+  (( GPU_INFO_LOADED == 1 )) && return 0
+  start_gpu_probe
+  wait "$GPU_PROBE_PID" || true
+  GPU_INFO=$(<"$GPU_PROBE_FILE")
+  GPU_INFO_LOADED=1
+}
+
+# GPU vendors from sysfs into GPU_VENDORS: display controllers (PCI class
+# 0x03xxxx) by vendor ID. Plain file reads, no lspci fork; empty when /sys
+# is unavailable.
+GPU_VENDORS=""
+
+detect_gpu_vendors() {
+  local d cls ven vendors=""
+  for d in /sys/bus/pci/devices/*; do
+    [[ -r "$d/class" && -r "$d/vendor" ]] || continue
+    read -r cls <"$d/class"
+    [[ "$cls" == 0x03* ]] || continue
+    read -r ven <"$d/vendor"
+    case "$ven" in
+      0x10de) vendors+=" nvidia" ;;
+      0x1002) vendors+=" amd" ;;
+      0x8086) vendors+=" intel" ;;
+    esac
+  done
+  GPU_VENDORS=$vendors
 }
 
 summary_hardware() {
-  local gpu virt
-  gpu=$(lspci | grep -E 'VGA|3D' || true)
+  local virt
+  load_gpu_info
   virt=$(systemd-detect-virt || true)
-  echo "$gpu" | sed 's/^/  GPU: /'
+  echo "$GPU_INFO" | sed 's/^/  GPU: /'
   [[ -n "$virt" ]] && echo "  Virt: $virt"
 }
 
 enable_multilib() {
   msg "Enabling multilib (if needed)…"
-  if grep -Pzo '\[multilib\]\n#?Include = /etc/pacman.d/mirrorlist' /etc/pacman.conf >/dev/null 2>&1; then
-    run sudo sed -i '/^\[multilib\]/,/^Include/ s/^#//' /etc/pacman.conf
+  # Already enabled: no sed, no extra database sync
+  if grep -q '^\[multilib\]' /etc/pacman.conf 2>/dev/null; then
+    echo "  multilib already enabled."
+  elif grep -q '^#\[multilib\]' /etc/pacman.conf 2>/dev/null; then
+    run sudo sed -i '/^#\[multilib\]/,/^#\?Include/ s/^#//' /etc/pacman.conf
     run sudo pacman -Sy
   else
-    warn "[multilib] block not found in /etc/pacman.conf (already enabled?)."
+    warn "[multilib] block not found in /etc/pacman.conf."
   fi
 }
 
 install_flatpak() {
   msg "Installing Flatpak + Flathub…"
-  run sudo pacman -S --needed --noconfirm flatpak
+  install_from_repo flatpak
   if ! flatpak remote-list | grep -q flathub; then
     run sudo flatpak remote-add --if-not-exists flathub https://flathub.org/repo/flathub.flatpakrepo
   fi
 }
 
+# Driver packages per GPU vendor (NVIDIA proprietary only when nouveau is declined)
+GPU_PKGS_AMD=(mesa vulkan-radeon lib32-mesa lib32-vulkan-radeon)
+GPU_PKGS_INTEL=(mesa vulkan-intel lib32-mesa lib32-vulkan-intel)
+GPU_PKGS_NVIDIA=(nvidia nvidia-utils lib32-nvidia-utils)
+
 install_gpu_drivers() {
   msg "Detecting GPU and installing drivers…"
   local info
-  info=$(lspci | grep -E 'VGA|3D' || true)
-  if echo "$info" | grep -qi nvidia; then
+  local -a pkgs=()
+  detect_gpu_vendors
+  info=$GPU_VENDORS
+  if [[ -z "$info" ]]; then
+    load_gpu_info
+    info=${GPU_INFO,,}
+  fi
+  # Every detected vendor contributes its packages (hybrid laptops get both)
+  [[ "$info" == *amd* || "$info" == *radeon* ]] && pkgs+=("${GPU_PKGS_AMD[@]}")
+  [[ "$info" == *intel* ]] && pkgs+=("${GPU_PKGS_INTEL[@]}")
+  if [[ "$info" == *nvidia* ]]; then
     warn "NVIDIA detected. Preference: open‑source drivers (nouveau)."
     if ask_yn "Use open-source drivers (nouveau)?" Y; then
       switch_to_nouveau
     else
-      run sudo pacman -S --needed --noconfirm nvidia nvidia-utils lib32-nvidia-utils || true
+      pkgs+=("${GPU_PKGS_NVIDIA[@]}")
     fi
-  elif echo "$info" | grep -qi amd; then
-    run sudo pacman -S --needed --noconfirm mesa vulkan-radeon lib32-mesa lib32-vulkan-radeon || true
-  elif echo "$info" | grep -qi intel; then
-    run sudo pacman -S --needed --noconfirm mesa vulkan-intel lib32-mesa lib32-vulkan-intel || true
-  else
+  elif ((${#pkgs[@]} == 0)); then
     warn "GPU not clearly detected. Skipping automatic drivers."
   fi
+  install_from_repo "${pkgs[@]}" || true
 }
 
 enable_services() {
@@ -275,44 +366,46 @@ enable_services() {
 
 setup_audio() {
   msg "Audio: PipeWire (pulse/alsa)…"
-  run sudo pacman -S --needed --noconfirm pipewire pipewire-alsa pipewire-pulse wireplumber
+  install_from_repo "${PKG_AUDIO[@]}"
 }
 
 setup_network() {
   msg "Network: NetworkManager…"
-  run sudo pacman -S --needed --noconfirm networkmanager
+  install_from_repo "${PKG_NETWORK[@]}"
   run sudo systemctl enable --now NetworkManager
 }
 
 setup_printing() {
   msg "Printing: CUPS + tools…"
-  run sudo pacman -S --needed --noconfirm cups system-config-printer gutenprint
+  install_from_repo "${PKG_PRINTING[@]}"
   run sudo systemctl enable --now cups.service
 }
 
 setup_virtualization() {
   msg "Virtualization: libvirt/qemu/virt-manager…"
-  run sudo pacman -S --needed --noconfirm qemu-base libvirt virt-manager dnsmasq iptables-nft edk2-ovmf
+  install_from_repo "${PKG_VIRT[@]}"
   run sudo systemctl enable --now libvirtd
-  warn "Add your user to libvirt group if needed: sudo usermod -aG libvirt $USER"
+  # $USER may be unset (sudo, cron); only nag when the user is not a member yet
+  local user=${SUDO_USER:-${USER:-$(id -un)}}
+  if [[ " $(id -nG "$user" 2>/dev/null) " != *" libvirt "* ]]; then
+    warn "Add your user to libvirt group if needed: sudo usermod -aG libvirt $user"
+  fi
 }
 
 setup_laptop() {
   msg "Laptop optimizations: tlp/powertop…"
-  run sudo pacman -S --needed --noconfirm tlp tlp-rdw powertop
+  install_from_repo "${PKG_LAPTOP[@]}"
   run sudo systemctl enable --now tlp
   run sudo systemctl mask systemd-rfkill.service systemd-rfkill.socket || true
 }
 
 setup_fonts() {
   msg "Common fonts…"
-  run sudo pacman -S --needed --noconfirm ttf-dejavu noto-fonts noto-fonts-cjk noto-fonts-emoji
+  install_from_repo "${PKG_FONTS[@]}"
 }
 
 setup_firewall() {
-  if ! command -v ufw >/dev/null 2>&1; then
-    run sudo pacman -S --needed --noconfirm ufw
-  fi
+  install_from_repo "${PKG_FIREWALL[@]}"
   msg "Firewall: UFW…"
   run sudo systemctl enable --now ufw
   run sudo ufw default deny incoming
@@ -323,7 +416,7 @@ setup_firewall() {
 
 install_kde_full() {
   msg "Installing full KDE Plasma + SDDM…"
-  run sudo pacman -S --needed --noconfirm xorg-server sddm plasma-meta kde-applications-meta packagekit-qt5
+  install_from_repo "${PKG_KDE[@]}"
   setup_audio
   setup_network
   setup_fonts
@@ -336,6 +429,9 @@ switch_to_nouveau() {
   if pacman -Qq | grep -Eq '^(nvidia|nvidia-dkms|nvidia-utils|lib32-nvidia-utils)$'; then
     warn "Removing proprietary NVIDIA packages…"
     run sudo pacman -Rns --noconfirm nvidia nvidia-dkms nvidia-utils lib32-nvidia-utils || true
+    # -Rns also drops orphaned deps: re-read the installed set on next use
+    INSTALLED=()
+    INSTALLED_LOADED=0
   fi
   local pkgs=(xf86-video-nouveau mesa lib32-mesa)
   run sudo pacman -S --needed --noconfirm "${pkgs[@]}"
@@ -345,11 +441,57 @@ switch_to_nouveau() {
   warn "A reboot is recommended after switching to nouveau."
 }
 
+# Installed package names (pacman -Qq, repo + foreign), read once per run and
+# updated after each install so re-runs skip what is already there.
+declare -A INSTALLED=()
+INSTALLED_LOADED=0
+
+load_installed() {
+  (( INSTALLED_LOADED == 1 )) && return 0
+  local p
+  while read -r p; do INSTALLED[$p]=1; done < <(pacman -Qq 2>/dev/null || true)
+  INSTALLED_LOADED=1
+}
+
+# Valid pacman package name; anything else would abort the whole transaction
+PKG_NAME_RE='^[a-z0-9@_+][a-z0-9@._+-]*$'
+
+# Sets MISSING to the arguments that are not installed yet, deduplicated
+# in first-seen order (merged categories and GPU stacks overlap).
+# Malformed names are reported and dropped.
+filter_installed() {
+  load_installed
+  MISSING=()
+  local -A seen=()
+  local p
+  for p in "$@"; do
+    if [[ ! $p =~ $PKG_NAME_RE ]]; then
+      warn "Nom de paquet invalide ignoré: '$p'"
+      continue
+    fi
+    [[ -n "${INSTALLED[$p]:-}" || -n "${seen[$p]:-}" ]] && continue
+    seen[$p]=1
+    MISSING+=("$p")
+  done
+}
+
+mark_installed() {
+  local p
+  for p in "$@"; do INSTALLED[$p]=1; done
+}
+
 install_from_repo() {
   local -a pkgs=("$@")
   ((${#pkgs[@]})) || return 0
-  msg "Pacman: ${#pkgs[@]} paquet(s)"
-  run sudo pacman -S --needed --noconfirm -- "${pkgs[@]}"
+  filter_installed "${pkgs[@]}"
+  if ((${#MISSING[@]} == 0)); then
+    msg "Pacman: ${#pkgs[@]} paquet(s) déjà installé(s)"
+    return 0
+  fi
+  msg "Pacman: ${#MISSING[@]} paquet(s)"
+  # Record only what actually got installed; callers may ignore the failure
+  run sudo pacman -S --needed --noconfirm -- "${MISSING[@]}" \
+    && mark_installed "${MISSING[@]}"
 }
 
 install_from_aur() {
@@ -357,8 +499,14 @@ install_from_aur() {
   local -a pkgs=("$@")
   ((${#pkgs[@]})) || return 0
   [[ -z "$helper" ]] && { warn "AUR helper non trouvé, skip AUR."; return 0; }
-  msg "AUR ($helper): ${#pkgs[@]} paquet(s)"
-  run "$helper" -S --needed --noconfirm -- "${pkgs[@]}"
+  filter_installed "${pkgs[@]}"
+  if ((${#MISSING[@]} == 0)); then
+    msg "AUR ($helper): ${#pkgs[@]} paquet(s) déjà installé(s)"
+    return 0
+  fi
+  msg "AUR ($helper): ${#MISSING[@]} paquet(s)"
+  run env MAKEFLAGS="$AUR_MAKEFLAGS" "$helper" -S --needed --noconfirm -- "${MISSING[@]}" \
+    && mark_installed "${MISSING[@]}"
 }
 
 # Catégories (modifiables facilement)
@@ -370,18 +518,37 @@ PKG_COMM=(discord telegram-desktop)
 PKG_OFFICE=(libreoffice-fresh hunspell-fr noto-fonts ttf-dejavu)
 PKG_GAMING=(steam gamemode mangohud)
 
+# Paquets des étapes système (setup_*)
+PKG_AUDIO=(pipewire pipewire-alsa pipewire-pulse wireplumber)
+PKG_NETWORK=(networkmanager)
+PKG_FIREWALL=(ufw)
+PKG_FONTS=(ttf-dejavu noto-fonts noto-fonts-cjk noto-fonts-emoji)
+PKG_PRINTING=(cups system-config-printer gutenprint)
+PKG_VIRT=(qemu-base libvirt virt-manager dnsmasq iptables-nft edk2-ovmf)
+PKG_LAPTOP=(tlp tlp-rdw powertop)
+PKG_KDE=(xorg-server sddm plasma-meta kde-applications-meta packagekit-qt5)
+
 AUR_DEV=(visual-studio-code-bin)
 AUR_GAMING=(protonup-qt)
 
+# Apps avec sources multiples: label|repo|aur|flatpak (voir install_apps_priority)
+APPS_GAMING_EXTRAS=(
+  "Lutris|lutris|lutris|net.lutris.Lutris"
+  "Heroic||heroic-games-launcher-bin|com.heroicgameslauncher.hgl"
+  "Bottles|bottles|bottles|com.usebottles.bottles"
+  "PrismLauncher|prismlauncher|prismlauncher-bin|org.prismlauncher.PrismLauncher"
+  "ProtonUp-Qt|protonup-qt|protonup-qt|net.davidotek.pupgui2"
+)
+
 main() {
   DO_CHECK=${DO_CHECK:-0}
   if (( DO_CHECK == 1 )); then
-    preflight_report
-    exit 0
+    if preflight_report; then exit 0; else exit 1; fi
   fi
   check_distro || exit 1
   ensure_sudo || exit 1
   check_network || exit 1
+  start_gpu_probe
   ensure_pacman_db || exit 1
   ensure_timesync || true
   ensure_pacman_keys || true
@@ -396,43 +563,41 @@ main() {
       minimal)
         msg "Profile: minimal"
         # Minimal: no multilib/flatpak/KDE, open-source drivers, base utils, audio, network, firewall
-        install_gpu_drivers
-        install_from_repo "${PKG_BASE[@]}"
-        setup_audio
-        setup_network
-        setup_firewall
-        enable_services
+        STEP_TOTAL=6
+        step; install_gpu_drivers
+        # One transaction for everything; the setup_* steps then only configure
+        step; install_from_repo "${PKG_BASE[@]}" "${PKG_AUDIO[@]}" "${PKG_NETWORK[@]}" "${PKG_FIREWALL[@]}"
+        step; setup_audio
+        step; setup_network
+        step; setup_firewall
+        step; enable_services
         msg "Minimal profile applied."
         exit 0
         ;;
       gaming)
         msg "Profile: Gaming"
-        enable_multilib
-        install_flatpak
-        install_gpu_drivers
-        install_from_repo "${PKG_BASE[@]}" "${PKG_GAMING[@]}"
+        STEP_TOTAL=8
+        step; enable_multilib
+        step; install_flatpak
+        step; install_gpu_drivers
+        step; install_from_repo "${PKG_BASE[@]}" "${PKG_GAMING[@]}" "${PKG_AUDIO[@]}" "${PKG_NETWORK[@]}"
         # Extras gaming avec priorités
-        install_app_priority "Lutris" lutris lutris "net.lutris.Lutris"
-        install_app_priority "Heroic" "" heroic-games-launcher-bin "com.heroicgameslauncher.hgl"
-        install_app_priority "Bottles" bottles bottles "com.usebottles.bottles"
-        install_app_priority "PrismLauncher" prismlauncher prismlauncher-bin "org.prismlauncher.PrismLauncher"
-        install_app_priority "ProtonUp-Qt" protonup-qt protonup-qt "net.davidotek.pupgui2"
-        setup_audio
-        setup_network
-        enable_services
+        step; install_apps_priority "${APPS_GAMING_EXTRAS[@]}"
+        step; setup_audio
+        step; setup_network
+        step; enable_services
         msg "Gaming profile applied."
         exit 0
         ;;
       kde)
         msg "Profile: full KDE"
-        enable_multilib
-        install_flatpak
-        install_gpu_drivers
-        install_kde_full
-        install_from_repo "${PKG_BASE[@]}"
-        setup_audio
-        setup_network
-        enable_services
+        STEP_TOTAL=6
+        step; enable_multilib
+        step; install_flatpak
+        step; install_gpu_drivers
+        step; install_from_repo "${PKG_KDE[@]}" "${PKG_BASE[@]}" "${PKG_AUDIO[@]}" "${PKG_NETWORK[@]}" "${PKG_FONTS[@]}"
+        step; install_kde_full
+        step; enable_services
         msg "KDE profile applied."
         exit 0
         ;;
@@ -446,40 +611,40 @@ main() {
   if ask_yn "Install detected GPU drivers?" Y; then install_gpu_drivers; fi
   if ask_yn "Install full KDE (Plasma + apps + SDDM)?" N; then install_kde_full; fi
 
-  # Repo categories
-  if ask_yn "Install Base utils (recommended)?" Y; then install_from_repo "${PKG_BASE[@]}"; fi
-  if ask_yn "Install Dev?" N; then install_from_repo "${PKG_DEV[@]}"; fi
-  if ask_yn "Install Media?" N; then install_from_repo "${PKG_MEDIA[@]}"; fi
-  if ask_yn "Install Browsers?" N; then install_from_repo "${PKG_BROWSERS[@]}"; fi
-  if ask_yn "Install Communication?" N; then install_from_repo "${PKG_COMM[@]}"; fi
-  if ask_yn "Install Office/Fonts?" N; then install_from_repo "${PKG_OFFICE[@]}"; fi
-  if ask_yn "Install Gaming?" N; then install_from_repo "${PKG_GAMING[@]}"; fi
-
-  # Extras Gaming (priorités repo > AUR > Flatpak)
+  # Repo categories (collected first, then installed in a single pacman transaction)
+  local -a repo_pkgs=()
+  if ask_yn "Install Base utils (recommended)?" Y; then repo_pkgs+=("${PKG_BASE[@]}"); fi
+  if ask_yn "Install Dev?" N; then repo_pkgs+=("${PKG_DEV[@]}"); fi
+  if ask_yn "Install Media?" N; then repo_pkgs+=("${PKG_MEDIA[@]}"); fi
+  if ask_yn "Install Browsers?" N; then repo_pkgs+=("${PKG_BROWSERS[@]}"); fi
+  if ask_yn "Install Communication?" N; then repo_pkgs+=("${PKG_COMM[@]}"); fi
+  if ask_yn "Install Office/Fonts?" N; then repo_pkgs+=("${PKG_OFFICE[@]}"); fi
+  if ask_yn "Install Gaming?" N; then repo_pkgs+=("${PKG_GAMING[@]}"); fi
+  install_from_repo "${repo_pkgs[@]}"
+
+  # Extras (priorités repo > AUR > Flatpak), installed together once chosen
+  local -a apps=()
   if (( EXTRAS_GAMING == 1 )) || ask_yn "Installer extras Gaming (Lutris, Heroic, Bottles, PrismLauncher, ProtonUp-Qt) ?" N; then
-    install_app_priority "Lutris" lutris lutris "net.lutris.Lutris"
-    install_app_priority "Heroic" "" heroic-games-launcher-bin "com.heroicgameslauncher.hgl"
-    install_app_priority "Bottles" bottles bottles "com.usebottles.bottles"
-    install_app_priority "PrismLauncher" prismlauncher prismlauncher-bin "org.prismlauncher.PrismLauncher"
-    install_app_priority "ProtonUp-Qt" protonup-qt protonup-qt "net.davidotek.pupgui2"
+    apps+=("${APPS_GAMING_EXTRAS[@]}")
   fi
-
   # Browser extras
-  if (( FLAG_CHROMIUM == 1 )) || ask_yn "Install Chromium (repo)?" N; then install_from_repo chromium; fi
+  if (( FLAG_CHROMIUM == 1 )) || ask_yn "Install Chromium (repo)?" N; then apps+=("Chromium|chromium||"); fi
   if (( FLAG_CHROME == 1 )) || ask_yn "Install Google Chrome (AUR/Flatpak)?" N; then
-    install_app_priority "Google Chrome" "" google-chrome "com.google.Chrome"
+    apps+=("Google Chrome||google-chrome|com.google.Chrome")
   fi
   # Media extras
   if (( FLAG_SPOTIFY == 1 )) || ask_yn "Install Spotify (AUR/Flatpak)?" N; then
-    install_app_priority "Spotify" "" spotify "com.spotify.Client"
+    apps+=("Spotify||spotify|com.spotify.Client")
   fi
+  install_apps_priority "${apps[@]}"
 
   # AUR (optional)
-  local helper
-  helper=$(detect_aur_helper)
-  if [[ -n "$helper" ]]; then
-    if ask_yn "Install Dev (AUR)?" N; then install_from_aur "$helper" "${AUR_DEV[@]}"; fi
-    if ask_yn "Install Gaming (AUR)?" N; then install_from_aur "$helper" "${AUR_GAMING[@]}"; fi
+  detect_aur_helper
+  if [[ -n "$AUR_HELPER" ]]; then
+    local -a aur_pkgs=()
+    if ask_yn "Install Dev (AUR)?" N; then aur_pkgs+=("${AUR_DEV[@]}"); fi
+    if ask_yn "Install Gaming (AUR)?" N; then aur_pkgs+=("${AUR_GAMING[@]}"); fi
+    install_from_aur "$AUR_HELPER" "${aur_pkgs[@]}"
   else
     warn "AUR helper not detected (paru/yay). Skipping AUR."
   fi